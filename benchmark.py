@@ -0,0 +1,84 @@
+# Benchmark decode and render stages against recorded OCR output, no tesseract needed
+#   python benchmark.py [recording directory] [repeats]
+# Recordings are made by setting ocr_backend = record in the ADMIN section of config.ini.
+# Replay must use the same [ocr settings] as when recording, other settings make different OCR calls
+# that have no recorded output. Sources without matching recordings are skipped.
+# The read_image stage is the replayed backend/cascade call, including image hashing and its console output.
+# Tk needs a display, on a headless box run through xvfb-run.
+
+from PIL import Image
+from code_solver import CodeSolver
+from ocr_backend import ReplayBackend, RecordingNotFoundError
+import sys
+import time
+
+
+def time_ms(func, repeats):
+    timings = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, min(timings), sum(timings) / len(timings)
+
+
+def main(directory='recordings', repeats=20):
+    try:
+        backend = ReplayBackend(directory)
+    except FileNotFoundError:
+        print('Did not find recording directory {}'.format(directory))
+        return
+
+    solver = CodeSolver(start_mainloop=False)
+    solver.ocr_backend = backend
+    solver.root.update()
+
+    sources = solver.ocr_backend.source_images()
+    if not sources:
+        print('No recorded source images in {}'.format(directory))
+
+    print('{:<32}{:>12}{:>12}'.format('stage', 'min (ms)', 'mean (ms)'))
+    for path in sources:
+        image = Image.open(path)
+        image.load()
+        solver.image = image
+        w, h = image.size
+        solver.aspect_ratio = w / h
+        solver.new_image = True
+        solver.redraw()
+
+        try:
+            result, *ocr_timing = time_ms(lambda: solver.read_image(image), repeats)
+        except RecordingNotFoundError as e:
+            print('Skipping {}: {}'.format(path, e))
+            continue
+        if not result:
+            print('Skipping {}: invalid OCR settings'.format(path))
+            continue
+        raw_data, solver.bounding_boxes = result
+
+        _, *interpret_timing = time_ms(lambda: solver.interpret_by_regex(raw_data), repeats)
+        _, *layout_timing = time_ms(lambda: solver.interpret_by_layout(solver.bounding_boxes), repeats)
+        clean_data = solver.get_tokens(raw_data, solver.bounding_boxes)
+        _, *translate_timing = time_ms(lambda: solver.translate_and_apply(clean_data), repeats)
+
+        # redraw clears the canvas, so every repeat renders the image and boxes once
+        def render():
+            solver.redraw(False)
+            solver.draw_boxes_on_canvas()
+        _, *draw_timing = time_ms(render, repeats)
+
+        print(path)
+        for stage, timing in (('read_image (replay)', ocr_timing),
+                              ('interpret_by_regex', interpret_timing),
+                              ('interpret_by_layout', layout_timing),
+                              ('translate_and_apply', translate_timing),
+                              ('redraw + draw_boxes_on_canvas', draw_timing)):
+            print('  {:<30}{:>12.3f}{:>12.3f}'.format(stage, *timing))
+
+    solver.root.destroy()
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2], *[int(x) for x in sys.argv[2:3]])
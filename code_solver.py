@@ -4,7 +4,9 @@
 from PIL import Image, ImageTk, ImageGrab
 from pytesseract import pytesseract
 from ascii_table import ascii_table
+from ocr_backend import TesseractBackend, RecordingBackend, ReplayBackend, RecordingNotFoundError
 import re
+import bisect
 from datetime import datetime
 import logging
 import traceback
@@ -14,8 +16,15 @@ from tkinter import Tk, Frame, Label, Entry, TOP, RIGHT, BOTTOM, LEFT, YES, NO,
     messagebox
 import hashlib
 import uuid
-from ctypes import windll
+import ctypes
 import configparser
+import time
+import os
+import io
+import functools
+import cProfile
+import pstats
+import tracemalloc
 
 
 class CodeSolver:
@@ -38,16 +47,35 @@ class CodeSolver:
             'resize_threshold': 1,  # Prevents resizing on small canvas changes},
             'center_image_on_canvas': True,
             'canvas_update_delay': 250
+        },
+        'ocr settings': {
+            'use_ocr_cascade': True,
+            'cascade_scales': '0.5, 1.0',  # Resolution tiers tried from low to high
+            'min_mean_confidence': 70,  # Mean character confidence (0-100) needed to accept a tier
+            'min_lookup_ratio': 0.8,  # Share of tokens that must resolve in the ascii lookup
+            'max_region_ratio': 0.25,  # Max share of low confidence words that are re-read instead of escalating
+            'full_pass_reference': 0,  # Seconds for a full resolution crack, 0 measures it from escalated cracks
+            'use_layout_tokens': True,  # Pair glyphs within words found from box geometry instead of flat text
+            'word_gap_factor': 0.35,  # Horizontal gap, relative to median glyph height, that splits words
+            'column_gap_factor': 2.0  # Horizontal gap, relative to median glyph height, that splits columns
         }
     }
     sys_cfg = config['system parameters']  # Short names
     win_cfg = config['window settings']
     can_cfg = config['canvas settings']
+    ocr_cfg = config['ocr settings']
     config_parser = None
 
     # Admin settings will always load default unless accepted admin login
     adm_cfg = {
-        'use_local_image': False
+        'use_local_image': False,
+        'enable_profiling': False,
+        'profile_directory': 'profiles',
+        'profile_top_n': 15,
+        'profile_max_captures': 20,  # Per profiled method, later calls run unprofiled
+        'profile_min_interval': 2.0,  # Seconds between captures of the same method, e.g. redraws while resizing
+        'ocr_backend': 'tesseract',  # tesseract, record or replay
+        'ocr_recording_directory': 'recordings'
     }
     # Hashed admin password
     admin_password = '0368a552db2565de91a7c69b0ed21e3c20e6052856695566d346a68ba30c8de2:7d33d1e23a954159b5ec58a3ecd7b641'
@@ -89,10 +117,17 @@ class CodeSolver:
 
     # Program variables
     pending_timed_highlight = False
+    profiling_active = False
+    profile_logger = None
+    profile_captures = None
 
     # Lookup
     ascii_lookup = None
 
+    # OCR
+    ocr_backend = None
+    ocr_stats = None
+
     # List of chars that commonly incorrectly translate ordered by priority
     # Keys should be caps and value must be a set of valid hexadecimal symbols
     ambiguous_chars = {'G': '6',
@@ -102,13 +137,13 @@ class CodeSolver:
                        'B': '8',  # These are both hexadecimal chars
                        '8': 'B'}
 
-    def __init__(self):
+    def __init__(self, start_mainloop=True):
         # Read config
         self.read_config()
 
         # Necessary to get PIL to work correctly on high DPI scaling
-        if self.sys_cfg['set_dpi_awareness']:
-            user32 = windll.user32
+        if self.sys_cfg['set_dpi_awareness'] and hasattr(ctypes, 'windll'):
+            user32 = ctypes.windll.user32
             user32.SetProcessDPIAware()
 
         # Load and structure lookup
@@ -117,8 +152,19 @@ class CodeSolver:
             row = row.split(',')
             self.ascii_lookup[row[3].upper()] = row[4]
 
+        self.ocr_stats = {'cracks': 0,
+                          'tiers': {},
+                          'total_time': 0.0,
+                          'full_pass_time': 0.0,
+                          'full_pass_count': 0}
+        self.ocr_backend = self.create_ocr_backend()
+
+        # Wrap profiled methods, leaves them untouched when profiling is disabled
+        if self.adm_cfg['enable_profiling']:
+            self.init_profiling()
+
         # Start gui
-        self.init_gui()
+        self.init_gui(start_mainloop)
 
     def read_config(self):
         try:
@@ -134,9 +180,12 @@ class CodeSolver:
                 if self.admin_privileges:
                     # Read requested admin settings
                     for sub_key in self.adm_cfg:
-                        val = self.resolve_type(self.config_parser, 'ADMIN', sub_key)
-                        self.adm_cfg[sub_key] = val
-                        print('set admin config [{}] to {}'.format(sub_key, val))
+                        try:
+                            val = self.resolve_type(self.config_parser, 'ADMIN', sub_key)
+                            self.adm_cfg[sub_key] = val
+                            print('set admin config [{}] to {}'.format(sub_key, val))
+                        except KeyError:
+                            pass
 
             # Read all parameters specified in config
             print('Reading config')
@@ -184,6 +233,70 @@ class CodeSolver:
         except:
             traceback.print_exc()
 
+    def init_profiling(self):
+        os.makedirs(self.adm_cfg['profile_directory'], exist_ok=True)
+        self.profile_logger = logging.getLogger('profiler')
+        self.profile_logger.setLevel(logging.INFO)
+        self.profile_logger.propagate = False
+        self.profile_logger.addHandler(
+            logging.FileHandler(os.path.join(self.adm_cfg['profile_directory'], 'profile.log')))
+
+        self.profile_captures = {}
+        self.start_cracking = self.profiled(self.start_cracking)
+        self.redraw = self.profiled(self.redraw)
+        print('Profiling enabled, captures are saved to {}'.format(self.adm_cfg['profile_directory']))
+
+    def profiled(self, func):
+        """
+        :param func: Bound method to capture cProfile stats and tracemalloc snapshots around.
+        :return: Wrapped method.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Nested calls are covered by the outer capture
+            if self.profiling_active:
+                return func(*args, **kwargs)
+
+            # Limit captures so bursts of calls don't flood the profile directory
+            count, last_capture = self.profile_captures.get(func.__name__, (0, None))
+            now = time.perf_counter()
+            if (self.adm_cfg['profile_max_captures'] <= count
+                    or last_capture is not None and now - last_capture < self.adm_cfg['profile_min_interval']):
+                return func(*args, **kwargs)
+            self.profile_captures[func.__name__] = (count + 1, now)
+
+            self.profiling_active = True
+            profiler = cProfile.Profile()
+            tracemalloc.start()
+            profiler.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.disable()
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                self.profiling_active = False
+                self.save_profile(func.__name__, profiler, snapshot)
+
+        return wrapper
+
+    def save_profile(self, name, profiler, snapshot):
+        try:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            path = os.path.join(self.adm_cfg['profile_directory'], '{}_{}'.format(name, timestamp))
+            profiler.dump_stats(path + '.prof')
+            snapshot.dump(path + '.snapshot')
+
+            # Summarize hot functions and allocations
+            top_n = self.adm_cfg['profile_top_n']
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(top_n)
+            allocations = '\n'.join(str(x) for x in snapshot.statistics('lineno')[:top_n])
+            self.profile_logger.info('{} captured to {}\n{}\nTop allocations:\n{}\n'.format(
+                name, path, stream.getvalue(), allocations))
+        except:
+            traceback.print_exc()
+
     def window_close(self):
         if messagebox.askyesno("Closing", "Exit program?"):
             self.write_config()
@@ -236,7 +349,7 @@ class CodeSolver:
             print('***Incorrect administrator password***')
             self.timed_highlight(parent, entry_widget)
 
-    def init_gui(self):
+    def init_gui(self, start_mainloop=True):
         # Root config
         self.root = Tk()
         self.root.report_callback_exception = lambda a_, b_, c_: self.elevate_error()
@@ -335,7 +448,8 @@ class CodeSolver:
         self.pending_redraw = BooleanVar()
 
         # Start mainloop
-        self.root.mainloop()
+        if start_mainloop:
+            self.root.mainloop()
 
     def image_grab(self):
         self.set_root_alpha(0)
@@ -545,9 +659,18 @@ class CodeSolver:
     def start_cracking(self, image):
         raw_data = self.get_data_from_image(image)
         if raw_data:
-            clean_data = self.interpret_by_regex(raw_data)
+            clean_data = self.get_tokens(raw_data, self.bounding_boxes)
             self.translate_and_apply(clean_data)
 
+    def get_tokens(self, data, boxes):
+        # Layout tokens from the boxes when enabled, the regex on the flat text otherwise or as fallback
+        tokens = None
+        if self.ocr_cfg['use_layout_tokens'] and boxes:
+            tokens = self.interpret_by_layout(boxes)
+        if not tokens:
+            tokens = self.interpret_by_regex(data)
+        return tokens
+
     def interpret_by_regex(self, data):
         special_cases = ''
         for key in self.ambiguous_chars:
@@ -555,35 +678,374 @@ class CodeSolver:
         p = re.compile('[0-9a-fA-F' + special_cases + ']{2}')
         return p.findall(data)
 
+    def interpret_by_layout(self, boxes):
+        """
+        Pairs hex-like glyphs only within words found from the character boxes.
+        :param boxes: Box output from tesseract, one 'c x0 y0 x1 y1 page' glyph per line.
+        :return: List of two character tokens in reading order.
+        """
+        valid_chars = set('0123456789abcdefABCDEF' + ''.join(self.ambiguous_chars))
+        tokens = []
+        for word in self.group_glyphs(boxes):
+            chars = [glyph[0] for glyph in word if glyph[0] in valid_chars]
+            if len(chars) % 2:
+                print('Odd number of symbols in word \'{}\''.format(''.join(glyph[0] for glyph in word)))
+            tokens += [chars[i] + chars[i + 1] for i in range(0, len(chars) - 1, 2)]
+        return tokens
+
+    def group_glyphs(self, boxes):
+        """
+        Groups glyphs into columns, lines and words by the gaps between their boxes.
+        :param boxes: Box output from tesseract.
+        :return: List of words in reading order, each a list of (c, x0, y0, x1, y1) glyphs.
+        """
+        glyphs = []
+        for box in boxes.split('\n'):
+            box = box.split(' ')
+            if len(box) < 5 or not box[0].strip():
+                continue
+            glyphs.append((box[0],) + tuple(int(x) for x in box[1:5]))
+        if not glyphs:
+            return []
+
+        heights = sorted(glyph[4] - glyph[2] for glyph in glyphs)
+        median_height = max(1, heights[len(heights) // 2])
+        word_gap = self.ocr_cfg['word_gap_factor'] * median_height
+        column_gap = self.ocr_cfg['column_gap_factor'] * median_height
+
+        # Columns: sweep left to right, merging glyphs whose horizontal spans are closer than the column gap
+        columns = []
+        column_right = None
+        for glyph in sorted(glyphs, key=lambda g: g[1]):
+            if column_right is None or column_gap < glyph[1] - column_right:
+                columns.append([])
+                column_right = glyph[3]
+            columns[-1].append(glyph)
+            column_right = max(column_right, glyph[3])
+
+        words = []
+        for column in columns:
+            # Lines: sweep top to bottom (box y is measured from the bottom), a glyph whose
+            # vertical center falls within the current line's span joins it
+            lines = []
+            line_bottom = None
+            for glyph in sorted(column, key=lambda g: -(g[2] + g[4])):
+                if line_bottom is None or (glyph[2] + glyph[4]) / 2 < line_bottom:
+                    lines.append([])
+                    line_bottom = glyph[2]
+                lines[-1].append(glyph)
+                line_bottom = min(line_bottom, glyph[2])
+
+            # Words: sweep each line left to right, splitting on gaps wider than the word gap
+            for line in lines:
+                line.sort(key=lambda g: g[1])
+                words.append([line[0]])
+                for prev, glyph in zip(line, line[1:]):
+                    if word_gap < glyph[1] - prev[3]:
+                        words.append([])
+                    words[-1].append(glyph)
+
+        return words
+
     def get_data_from_image(self, image):
         try:
-            pytesseract.tesseract_cmd = self.sys_cfg['tesseract_directory']
-            self.bounding_boxes = pytesseract.image_to_boxes(image)
+            result = self.read_image(image)
+            if not result:
+                return
+            data, self.bounding_boxes = result
             self.redraw(False)
-            return pytesseract.image_to_string(image)
+            return data
 
         except pytesseract.TesseractNotFoundError:
             self.set_status('Did not find tesseract.exe at specified directory', 'red')
 
-    def translate_and_apply(self, data):
-        output_str = ''
-        for hex_num in data:
+        except RecordingNotFoundError:
+            traceback.print_exc()
+            self.set_status('Image has no OCR recording to replay', 'red')
+
+    def read_image(self, image):
+        """
+        Runs OCR on the image through the current backend without touching the canvas.
+        :param image: PIL image to read.
+        :return: Tuple of (text, bounding boxes), or None if the cascade settings are invalid.
+        """
+        self.ocr_backend.record_source(image)
+        if self.ocr_cfg['use_ocr_cascade']:
+            scales = self.get_cascade_scales()
+            if not scales:
+                self.set_status('Invalid cascade_scales in config.ini', 'red')
+                return None
+            return self.cascade_ocr(image, scales)
+        return self.ocr_backend.image_to_string(image), self.ocr_backend.image_to_boxes(image)
+
+    def create_ocr_backend(self):
+        mode = self.adm_cfg['ocr_backend']
+        directory = self.adm_cfg['ocr_recording_directory']
+        if mode == 'record':
+            print('Recording OCR output to {}'.format(directory))
+            return RecordingBackend(directory, self.sys_cfg['tesseract_directory'])
+        elif mode == 'replay':
             try:
-                hex_num = hex_num.upper()
+                backend = ReplayBackend(directory)
+                print('Replaying OCR output from {}'.format(directory))
+                if not backend.recordings:
+                    print('***No OCR recordings found in {}***'.format(directory))
+                return backend
+            except FileNotFoundError:
+                print('***Did not find OCR recording directory {}, using tesseract***'.format(directory))
+        return TesseractBackend(self.sys_cfg['tesseract_directory'])
+
+    def cascade_ocr(self, image, scales):
+        """
+        Reads the image starting at the lowest resolution tier and only escalates when the result is unreliable.
+        :param image: PIL image to read.
+        :param scales: Ascending resolution tiers ending with 1.0.
+        :return: Tuple of (text, bounding boxes) with boxes in the coordinates of the original image.
+        """
+        start = time.perf_counter()
+        w, h = image.size
+
+        for i, scale in enumerate(scales):
+            if scale < 1:
+                tier_image = image.resize((max(1, int(w * scale)), max(1, int(h * scale))), Image.LANCZOS)
+            else:
+                tier_image = image
+            tier = '{:g}x'.format(scale)
+
+            # Each tier is judged on the same words and boxes that get decoded
+            pass_start = time.perf_counter()
+            words = self.read_words(tier_image)
+            boxes = self.ocr_backend.image_to_boxes(tier_image)
+            if scale != 1:
+                boxes = self.rescale_boxes(boxes, 1 / scale)
+            else:
+                # A full resolution crack costs reading both data and boxes
+                self.ocr_stats['full_pass_time'] += time.perf_counter() - pass_start
+                self.ocr_stats['full_pass_count'] += 1
+
+            if i == len(scales) - 1 or self.accept_ocr_words(words, boxes):
+                break
 
-                # Replace chars ordered by priority until one makes a key match
-                for key in self.ambiguous_chars:
-                    if hex_num in self.ascii_lookup.keys():
-                        break
+            # Re-read only the uncertain words at full resolution when they are few
+            low_words = [word for word in words if word['conf'] < self.ocr_cfg['min_mean_confidence']]
+            if low_words and len(low_words) / len(words) <= self.ocr_cfg['max_region_ratio']:
+                boxes = self.reread_regions(image, low_words, scale, boxes)
+                if self.accept_ocr_words(words, boxes):
+                    tier += ' + regions'
+                    break
 
-                    for c in self.ambiguous_chars[key]:
-                        replacement = c
-                        print('attempting to replace \'{}\' with \'{}\''.format(key, replacement))
-                        hex_num = hex_num.replace(key, replacement)
-                        if hex_num in self.ascii_lookup.keys():
-                            print('new key match: {}'.format(hex_num))
-                            break
+        self.update_ocr_stats(tier, time.perf_counter() - start)
+        return self.join_words(words), boxes
+
+    def get_cascade_scales(self):
+        """
+        :return: Sorted tiers always ending with a full resolution pass, or None if the setting is invalid.
+        """
+        scales = self.ocr_cfg['cascade_scales']
+
+        # resolve_type reads a single 1 or 0 as a boolean
+        if isinstance(scales, bool):
+            scales = int(scales)
+
+        try:
+            scales = sorted({float(x) for x in str(scales).split(',') if x.strip()})
+        except ValueError:
+            print('Invalid cascade_scales: {}'.format(self.ocr_cfg['cascade_scales']))
+            return None
+        return [x for x in scales if 0 < x < 1] + [1.0]
+
+    def read_words(self, image, config=''):
+        words = []
+        rows = self.ocr_backend.image_to_data(image, config=config).split('\n')
+        for row in rows[1:]:
+            row = row.split('\t')
+            if len(row) < 12 or not row[11].strip() or float(row[10]) < 0:
+                continue
+            words.append({'line': tuple(int(x) for x in row[1:5]),
+                          'box': tuple(int(x) for x in row[6:10]),
+                          'conf': float(row[10]),
+                          'text': row[11].strip()})
+        return words
 
+    @staticmethod
+    def join_words(words):
+        # Rebuild the text layout from tesseract's page/block/paragraph/line numbering
+        lines = []
+        last_line = None
+        for word in words:
+            if word['line'] != last_line:
+                lines.append([])
+                last_line = word['line']
+            lines[-1].append(word['text'])
+        return '\n'.join(' '.join(line) for line in lines)
+
+    def accept_ocr_words(self, words, boxes):
+        if not words:
+            return False
+
+        # Word confidences weighted by length approximates the mean character confidence
+        n_chars = sum(len(word['text']) for word in words)
+        confidence = sum(word['conf'] * len(word['text']) for word in words) / n_chars
+
+        tokens = self.get_tokens(self.join_words(words), boxes)
+        if not tokens:
+            return False
+        resolved = [self.resolve_ambiguous(token, verbose=False) for token in tokens]
+        lookup_ratio = sum(token in self.ascii_lookup for token in resolved) / len(tokens)
+
+        print('ocr confidence: {:.1f}, lookup ratio: {:.2f}'.format(confidence, lookup_ratio))
+        return (self.ocr_cfg['min_mean_confidence'] <= confidence
+                and self.ocr_cfg['min_lookup_ratio'] <= lookup_ratio)
+
+    def reread_regions(self, image, words, scale, boxes, padding=4):
+        """
+        Re-reads the given words from the full resolution image and updates them in place. The regions are
+        stacked into one composite image so the re-read costs the same two tesseract calls however many there are.
+        :param image: Full resolution PIL image.
+        :param words: Words from read_words on the tier image.
+        :param scale: Scale of the tier image.
+        :param boxes: Boxes of the tier in full resolution coordinates.
+        :return: Boxes with the glyphs inside the re-read regions replaced.
+        """
+        w, h = image.size
+        regions = []
+        for word in words:
+            left, top, width, height = [x / scale for x in word['box']]
+            regions.append((max(0, int(left) - padding), max(0, int(top) - padding),
+                            min(w, int(left + width) + padding), min(h, int(top + height) + padding)))
+
+        # Stack the regions vertically, separated by blank gaps
+        offsets = []
+        composite_height = 0
+        for region in regions:
+            offsets.append(composite_height)
+            composite_height += region[3] - region[1] + 2 * padding
+        composite = Image.new('RGB', (max(x[2] - x[0] for x in regions), composite_height), 'white')
+        for region, offset in zip(regions, offsets):
+            composite.paste(image.crop(region).convert('RGB'), (0, offset))
+
+        def region_index(y):
+            # Region containing the composite y (measured from the top), None when in a gap
+            i = bisect.bisect_right(offsets, y) - 1
+            if 0 <= i and y < offsets[i] + regions[i][3] - regions[i][1]:
+                return i
+            return None
+
+        region_words = [[] for _ in regions]
+        for region_word in self.read_words(composite, config='--psm 6'):
+            left, top, width, height = region_word['box']
+            i = region_index(top + height / 2)
+            if i is not None:
+                region_words[i].append(region_word)
+
+        # Move boxes from composite to region coordinates, box y is measured from the bottom
+        region_boxes = [[] for _ in regions]
+        for box in self.ocr_backend.image_to_boxes(composite, config='--psm 6').split('\n'):
+            box = box.split(' ')
+            if len(box) < 5:
+                continue
+            x0, y0, x1, y1 = [int(x) for x in box[1:5]]
+            i = region_index(composite_height - (y0 + y1) / 2)
+            if i is not None:
+                y_offset = composite_height - offsets[i] - (regions[i][3] - regions[i][1])
+                box[1:5] = [str(x) for x in (x0, y0 - y_offset, x1, y1 - y_offset)]
+                region_boxes[i].append(' '.join(box))
+
+        for word, region, new_words, new_boxes in zip(words, regions, region_words, region_boxes):
+            if new_words:
+                print('re-read region {}: \'{}\' -> \'{}\''.format(
+                    region, word['text'], ' '.join(x['text'] for x in new_words)))
+                n_chars = sum(len(x['text']) for x in new_words)
+                word['text'] = ' '.join(x['text'] for x in new_words)
+                word['conf'] = sum(x['conf'] * len(x['text']) for x in new_words) / n_chars
+                boxes = self.splice_boxes(boxes, '\n'.join(new_boxes), region, h)
+        return boxes
+
+    @staticmethod
+    def splice_boxes(boxes, region_boxes, region, image_height):
+        """
+        :param boxes: Boxes in image coordinates.
+        :param region_boxes: Boxes read from the region crop.
+        :param region: (left, top, right, bottom) of the crop, measured from the top of the image.
+        :param image_height: Height of the image, box y is measured from the bottom.
+        :return: Boxes with the glyphs centered inside the region replaced by the region boxes.
+        """
+        left, top, right, bottom = region
+        spliced = []
+        for box in boxes.split('\n'):
+            split = box.split(' ')
+            if len(split) < 5:
+                continue
+            x0, y0, x1, y1 = [int(x) for x in split[1:5]]
+            if not (left <= (x0 + x1) / 2 <= right and top <= image_height - (y0 + y1) / 2 <= bottom):
+                spliced.append(box)
+
+        # Move region boxes from crop to image coordinates
+        y_offset = image_height - bottom
+        for box in region_boxes.split('\n'):
+            box = box.split(' ')
+            if len(box) < 5:
+                continue
+            x0, y0, x1, y1 = [int(x) for x in box[1:5]]
+            box[1:5] = [str(x) for x in (x0 + left, y0 + y_offset, x1 + left, y1 + y_offset)]
+            spliced.append(' '.join(box))
+        return '\n'.join(spliced)
+
+    @staticmethod
+    def rescale_boxes(boxes, factor):
+        rescaled = []
+        for box in boxes.split('\n'):
+            box = box.split(' ')
+            if len(box) < 5:
+                continue
+            box[1:5] = [str(int(round(int(x) * factor))) for x in box[1:5]]
+            rescaled.append(' '.join(box))
+        return '\n'.join(rescaled)
+
+    def update_ocr_stats(self, tier, elapsed):
+        stats = self.ocr_stats
+        stats['cracks'] += 1
+        stats['tiers'][tier] = stats['tiers'].get(tier, 0) + 1
+        stats['total_time'] += elapsed
+
+        # Savings compare every crack against a full resolution reference, the configured one if set, else
+        # the average measured on escalated cracks. Without either the savings are unknown
+        reference = self.ocr_cfg['full_pass_reference']
+        if not reference and stats['full_pass_count']:
+            reference = stats['full_pass_time'] / stats['full_pass_count']
+        if reference:
+            saved = '{:.2f}s'.format(reference - stats['total_time'] / stats['cracks'])
+        else:
+            saved = 'unknown'
+
+        usage = ', '.join('{}: {:.0%}'.format(key, val / stats['cracks']) for key, val in stats['tiers'].items())
+        print('ocr tier {} in {:.2f}s. Tier usage: {}. Average time saved: {}'.format(tier, elapsed, usage, saved))
+
+    def resolve_ambiguous(self, hex_num, verbose=True):
+        hex_num = hex_num.upper()
+
+        # Replace chars ordered by priority until one makes a key match
+        for key in self.ambiguous_chars:
+            if hex_num in self.ascii_lookup.keys():
+                break
+
+            for c in self.ambiguous_chars[key]:
+                replacement = c
+                if verbose:
+                    print('attempting to replace \'{}\' with \'{}\''.format(key, replacement))
+                hex_num = hex_num.replace(key, replacement)
+                if hex_num in self.ascii_lookup.keys():
+                    if verbose:
+                        print('new key match: {}'.format(hex_num))
+                    break
+
+        return hex_num
+
+    def translate_and_apply(self, data):
+        output_str = ''
+        for hex_num in data:
+            try:
+                hex_num = self.resolve_ambiguous(hex_num)
                 raw_str = self.ascii_lookup[hex_num]
                 output_str += raw_str.replace('SPACE', ' ')
 
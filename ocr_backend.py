@@ -0,0 +1,131 @@
+from pytesseract import pytesseract
+import hashlib
+import json
+import os
+
+
+class TesseractBackend:
+    """
+    Calls the tesseract binary through pytesseract.
+    """
+    def __init__(self, tesseract_cmd=None):
+        if tesseract_cmd:
+            pytesseract.tesseract_cmd = tesseract_cmd
+
+    def image_to_string(self, image, config=''):
+        return pytesseract.image_to_string(image, config=config)
+
+    def image_to_boxes(self, image, config=''):
+        return pytesseract.image_to_boxes(image, config=config)
+
+    def image_to_data(self, image, config=''):
+        return pytesseract.image_to_data(image, config=config)
+
+    def record_source(self, image):
+        # Only recording backends keep track of source images
+        pass
+
+
+def image_key(image):
+    """
+    :param image: PIL image.
+    :return: Hash identifying the image content.
+    """
+    header = '{}:{}x{}'.format(image.mode, *image.size).encode()
+    return hashlib.sha256(header + image.tobytes()).hexdigest()
+
+
+class RecordingBackend(TesseractBackend):
+    """
+    Calls tesseract and stores every image with its raw output in a recording directory.
+    """
+    def __init__(self, directory, tesseract_cmd=None):
+        super().__init__(tesseract_cmd)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def image_to_string(self, image, config=''):
+        return self.record(image, 'image_to_string', config, super().image_to_string(image, config))
+
+    def image_to_boxes(self, image, config=''):
+        return self.record(image, 'image_to_boxes', config, super().image_to_boxes(image, config))
+
+    def image_to_data(self, image, config=''):
+        return self.record(image, 'image_to_data', config, super().image_to_data(image, config))
+
+    def record_source(self, image):
+        recording = self.load(image)
+        recording['source'] = True
+        self.save(image, recording)
+
+    def record(self, image, call, config, result):
+        recording = self.load(image)
+        recording['calls'][call + '|' + config] = result
+        self.save(image, recording)
+        return result
+
+    def load(self, image):
+        path = os.path.join(self.directory, image_key(image) + '.json')
+        if os.path.isfile(path):
+            with open(path) as f:
+                return json.load(f)
+        return {'source': False, 'calls': {}}
+
+    def save(self, image, recording):
+        key = image_key(image)
+        image_path = os.path.join(self.directory, key + '.png')
+        if not os.path.isfile(image_path):
+            # Some modes such as CMYK can't be stored as png, recording must never break a crack
+            try:
+                image.save(image_path)
+            except (OSError, ValueError) as e:
+                print('Skipped recording image {}: {}'.format(key, e))
+                if os.path.isfile(image_path):
+                    os.remove(image_path)
+                return
+        with open(os.path.join(self.directory, key + '.json'), 'w') as f:
+            json.dump(recording, f, indent=2)
+
+
+class RecordingNotFoundError(Exception):
+    pass
+
+
+class ReplayBackend:
+    """
+    Serves OCR output from a recording directory instead of calling tesseract.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.recordings = {}
+
+        # Load all recordings up front so replayed calls only cost a lookup
+        for file_name in os.listdir(directory):
+            if file_name.endswith('.json'):
+                with open(os.path.join(directory, file_name)) as f:
+                    self.recordings[file_name[:-len('.json')]] = json.load(f)
+
+    def image_to_string(self, image, config=''):
+        return self.replay(image, 'image_to_string', config)
+
+    def image_to_boxes(self, image, config=''):
+        return self.replay(image, 'image_to_boxes', config)
+
+    def image_to_data(self, image, config=''):
+        return self.replay(image, 'image_to_data', config)
+
+    def record_source(self, image):
+        pass
+
+    def replay(self, image, call, config):
+        try:
+            return self.recordings[image_key(image)]['calls'][call + '|' + config]
+        except KeyError:
+            raise RecordingNotFoundError('No recorded {} for image in {}'.format(call, self.directory))
+
+    def source_images(self):
+        """
+        :return: Paths of the images that were passed to get_data_from_image while recording.
+        """
+        return sorted(os.path.join(self.directory, key + '.png')
+                      for key, recording in self.recordings.items() if recording['source'])